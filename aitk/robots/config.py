@@ -10,6 +10,7 @@
 
 import ast
 import os
+from functools import lru_cache
 
 JYROBOTPATH = None
 BACKEND = "pil"  # or any valid backends
@@ -17,9 +18,11 @@ ARGS = {}
 VALID_BACKENDS = ["canvas", "svg", "debug", "pil"]
 
 
+@lru_cache(maxsize=1)
 def get_aitk_search_paths():
     """
-    Get the aitk.robots search paths
+    Get the aitk.robots search paths. Cached; changing the path
+    with set_aitk_path() clears the cache.
     """
     custom = os.environ.get("JYROBOTPATH", JYROBOTPATH)
     here = os.path.abspath(os.path.dirname(__file__))
@@ -39,6 +42,7 @@ def set_aitk_path(path):
     """
     global JYROBOTPATH
     JYROBOTPATH = path
+    get_aitk_search_paths.cache_clear()
 
 
 def setup_backend():
@@ -201,14 +201,18 @@ class Camera:
         # Update timestamp:
         self.time = self.robot.world.time
 
-        for i in range(self.cameraShape[0]):
-            angle = i / self.cameraShape[0] * self.a - self.a / 2
-            self.hits[i] = self.robot.cast_ray(
-                self.robot.x,
-                self.robot.y,
-                PI_OVER_2 - self.robot.a - angle,
-                self.max_range,
-            )
+        # One ray per column, all sharing the robot's position; cast
+        # them as a single fan:
+        angles = [
+            PI_OVER_2 - self.robot.a - (i / self.cameraShape[0] * self.a - self.a / 2)
+            for i in range(self.cameraShape[0])
+        ]
+        self.hits = self.robot.cast_ray_fan(
+            self.robot.x,
+            self.robot.y,
+            angles,
+            self.max_range,
+        )
 
 
     def draw(self, backend):
@@ -294,18 +298,22 @@ class Camera:
                 # self.robot.world._ground_image_pixels[(x, y)] = (0, 0, 0)
                 # return c
 
-                sum = Color(0)
+                # Accumulate the channels as plain numbers; one Color
+                # is allocated for the final average:
+                red_sum = green_sum = blue_sum = 0
                 count = 0
                 # Need more sampling as distance increases:
                 for j in range(self.samples):
                     try:
-                        c = Color(*self.robot.world._ground_image_pixels[(x + j, y)])
+                        pixel = self.robot.world._ground_image_pixels[(x + j, y)]
                         # self.robot.world._ground_image_pixels[(x + j, y)] = (0, 0, 0)
                         count += 1
                     except Exception:
                         continue
-                    sum += c
-                return sum / count
+                    red_sum += pixel[0]
+                    green_sum += pixel[1]
+                    blue_sum += pixel[2]
+                return Color(red_sum / count, green_sum / count, blue_sum / count)
 
         return self.robot.world.ground_color
 
@@ -11,6 +11,8 @@ import importlib
 import math
 import re
 
+import numpy as np
+
 from .datasets import get_dataset
 from .hit import Hit
 from .utils import (
@@ -18,10 +20,12 @@ from .utils import (
     Color,
     Line,
     Point,
+    batched_fan_intersect_hit,
+    batched_intersect_hit,
     degrees_to_world,
     distance,
+    distance_squared,
     intersect,
-    intersect_hit,
     rotate_around,
     PI_OVER_180,
     PI_OVER_2,
@@ -651,6 +655,42 @@ class Robot:
         else:
             return (self.tvx / self.vx_max, self.tva / self.va_max)
 
+    def _assemble_hits(self, walls, hit, hx, hy, x1, y1, a):
+        """
+        Turn one ray's kernel results into a sorted list of Hits,
+        furthest away first (back to front).
+        """
+        hits = []
+        for i in range(len(walls)):
+            if hit[i]:
+                wall = walls[i]
+                # never detect hit with yourself
+                if wall.robot is self:
+                    continue
+                dist = distance(hx[i], hy[i], x1, y1)
+                height = 1.0 if wall.robot is None else wall.robot.height
+                color = wall.robot.color if wall.robot else wall.color
+                boundary = len(wall.lines) == 1
+                hits.append(
+                    Hit(
+                        wall.robot,
+                        height,
+                        hx[i],
+                        hy[i],
+                        dist,
+                        color,
+                        x1,
+                        y1,
+                        boundary,
+                        a,
+                    )
+                )
+
+        hits.sort(
+            key=lambda a: a.distance, reverse=True
+        )  # further away first, back to front
+        return hits
+
     def cast_ray(self, x1, y1, a, maxRange):
         """
         Cast a ray into this world and see what it hits.
@@ -658,42 +698,41 @@ class Robot:
         Returns list of hits, furthest away first (back to front)
         """
         # walls and robots
-        hits = []
         x2 = math.sin(a) * maxRange + x1
         y2 = math.cos(a) * maxRange + y1
 
-        for wall in self.world._walls:
-            # never detect hit with yourself
-            if wall.robot is self:
-                continue
-            for line in wall.lines:
-                p1 = line.p1
-                p2 = line.p2
-                pos = intersect_hit(x1, y1, x2, y2, p1.x, p1.y, p2.x, p2.y)
-                if pos is not None:
-                    dist = distance(pos[0], pos[1], x1, y1)
-                    height = 1.0 if wall.robot is None else wall.robot.height
-                    color = wall.robot.color if wall.robot else wall.color
-                    boundary = len(wall.lines) == 1
-                    hits.append(
-                        Hit(
-                            wall.robot,
-                            height,
-                            pos[0],
-                            pos[1],
-                            dist,
-                            color,
-                            x1,
-                            y1,
-                            boundary,
-                            a,
-                        )
-                    )
+        # The world caches all wall segments in parallel coordinate
+        # arrays, so the intersection tests run in one batched kernel:
+        walls, ax, ay, bx, by, sa, sb, sc = self.world._get_wall_segments()
+        if len(walls) == 0:
+            return []
+        hit, hx, hy = batched_intersect_hit(
+            float(x1), float(y1), float(x2), float(y2), ax, ay, bx, by, sa, sb, sc
+        )
+        return self._assemble_hits(walls, hit, hx, hy, x1, y1, a)
 
-        hits.sort(
-            key=lambda a: a.distance, reverse=True
-        )  # further away first, back to front
-        return hits
+    def cast_ray_fan(self, x1, y1, angles, maxRange):
+        """
+        Cast a fan of rays that share one origin, such as a camera's
+        column rays, in a single kernel call.
+
+        Returns one cast_ray-style hit list per angle.
+        """
+        walls, ax, ay, bx, by, sa, sb, sc = self.world._get_wall_segments()
+        if len(walls) == 0:
+            return [[] for angle in angles]
+        ex = np.empty(len(angles), dtype=np.float64)
+        ey = np.empty(len(angles), dtype=np.float64)
+        for j, a in enumerate(angles):
+            ex[j] = math.sin(a) * maxRange + x1
+            ey[j] = math.cos(a) * maxRange + y1
+        hit, hx, hy = batched_fan_intersect_hit(
+            float(x1), float(y1), ex, ey, ax, ay, bx, by, sa, sb, sc
+        )
+        return [
+            self._assemble_hits(walls, hit[j], hx[j], hy[j], x1, y1, angles[j])
+            for j in range(len(angles))
+        ]
 
     def _init_boundingbox(self):
         # First, find min/max points around robot (assumes box):
@@ -710,7 +749,10 @@ class Robot:
                 min_y = min(min_y, point[1])
                 max_x = max(max_x, point[0])
                 max_y = max(max_y, point[1])
-                max_dist = max(max_dist, distance(0, 0, point[0], point[1]))
+                # Compare squared distances; sqrt is taken once below:
+                max_dist = max(
+                    max_dist, distance_squared(0, 0, point[0], point[1])
+                )
 
         if (
             min_x == float("inf")
@@ -721,7 +763,7 @@ class Robot:
             return
 
         self._boundingbox = [min_x, min_y, max_x, max_y]
-        self.radius = max_dist
+        self.radius = math.sqrt(max_dist)
         ps = self._compute_boundingbox(self.x, self.y, self.a)
         self._update_boundingbox(*ps)
 
@@ -782,6 +824,11 @@ class Robot:
         self._bounding_lines[3].p2.x = p1[0]
         self._bounding_lines[3].p2.y = p1[1]
 
+        # The bounding lines back a Wall, so the world's cached
+        # segment arrays are now stale:
+        if self.world is not None:
+            self.world._invalidate_wall_segments()
+
     def _deltav(self, tv, v, maxv, ramp, time_step):
         # max change occurs in how long:
         seconds = ramp
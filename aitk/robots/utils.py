@@ -7,13 +7,13 @@
 # https://github.com/ArtificialIntelligenceToolkit/aitk.robots
 # ************************************************************
 
-import glob
 import io
 import json
 import math
 import os
-from collections import OrderedDict
-from datetime import datetime, timedelta
+
+import numpy as np
+import time
 from functools import wraps
 
 from .color_data import COLORS
@@ -22,23 +22,61 @@ from .config import get_aitk_search_paths
 PI_OVER_180 = math.pi / 180
 PI_OVER_2 = math.pi / 2
 ONE80_OVER_PI = 180 / math.pi
-TWO_PI = math.pi * 2
+TWO_PI = math.tau
+
+def display(*args, **kwargs):
+    """
+    Display the arguments in a notebook. IPython is imported on
+    first use so that headless runs don't pay its import cost.
+    """
+    try:
+        from IPython.display import display as ipython_display
+    except ImportError:
+        ipython_display = print
+    return ipython_display(*args, **kwargs)
+
 
 try:
-    from IPython.display import display
+    from numba import njit
 except ImportError:
-    display = print
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 def degrees_to_world(degrees):
-    return ((TWO_PI - (degrees * PI_OVER_180)) % TWO_PI)
+    if isinstance(degrees, np.ndarray):
+        return ((math.tau - (degrees * PI_OVER_180)) % math.tau)
+    # math.fmod plus a sign fix matches the % operator exactly, without
+    # the floored-division work Python's float % does:
+    r = math.fmod(math.tau - (degrees * PI_OVER_180), math.tau)
+    if r < 0.0:
+        r += math.tau
+    return r
 
 def world_to_degrees(direction):
-    return (((direction + TWO_PI) * -ONE80_OVER_PI) % 360)
+    if isinstance(direction, np.ndarray):
+        return (((direction + math.tau) * -ONE80_OVER_PI) % 360)
+    r = math.fmod((direction + math.tau) * -ONE80_OVER_PI, 360.0)
+    if r < 0.0:
+        r += 360.0
+    return r
 
 def rotate_around(x1, y1, length, angle):
     """
-    Swing a line around a point.
+    Swing a line around a point. Accepts scalars, or ndarrays
+    to swing a batch of lines at once.
     """
+    if isinstance(angle, np.ndarray):
+        return [x1 + length * np.cos(-angle),
+                y1 - length * np.sin(-angle)]
     return [x1 + length * math.cos(-angle),
             y1 - length * math.sin(-angle)]
 
@@ -112,45 +150,186 @@ def coefs(p1x, p1y, p2x, p2y):
     A = p1y - p2y
     B = p2x - p1x
     C = p1x * p2y - p2x * p1y
-    return [A, B, -C]
+    return (A, B, -C)
 
 
 def intersect_coefs(L1_0, L1_1, L1_2, L2_0, L2_1, L2_2):
+    # Returns (success, x, y):
     D = L1_0 * L2_1 - L1_1 * L2_0
     if D != 0:
         Dx = L1_2 * L2_1 - L1_1 * L2_2
         Dy = L1_0 * L2_2 - L1_2 * L2_0
         x1 = Dx / D
         y1 = Dy / D
-        return [x1, y1]
+        return (True, x1, y1)
     else:
-        return None
+        return (False, 0.0, 0.0)
 
 
-def intersect_hit(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
-    """
-    Compute the intersection between two lines.
-    """
+def _intersect_hit(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
     # http:##stackoverflow.com/questions/20677795/find-the-point-of-intersecting-lines
-    L1 = coefs(p1x, p1y, p2x, p2y)
-    L2 = coefs(p3x, p3y, p4x, p4y)
-    xy = intersect_coefs(L1[0], L1[1], L1[2], L2[0], L2[1], L2[2])
-    # now check to see on both segments:
-    if xy:
+    # coefs and intersect_coefs, inlined as straight-line arithmetic:
+    a1 = p1y - p2y
+    b1 = p2x - p1x
+    c1 = p2x * p1y - p1x * p2y
+    a2 = p3y - p4y
+    b2 = p4x - p3x
+    c2 = p4x * p3y - p3x * p4y
+    D = a1 * b2 - b1 * a2
+    if D != 0:
+        x = (c1 * b2 - b1 * c2) / D
+        y = (a1 * c2 - c1 * a2) / D
+        # now check to see on both segments:
         lowx = min(p1x, p2x) - 0.1
         highx = max(p1x, p2x) + 0.1
         lowy = min(p1y, p2y) - 0.1
         highy = max(p1y, p2y) + 0.1
-        if (lowx <= xy[0] and xy[0] <= highx) and (lowy <= xy[1] and xy[1] <= highy):
+        if (lowx <= x and x <= highx) and (lowy <= y and y <= highy):
             lowx = min(p3x, p4x) - 0.1
             highx = max(p3x, p4x) + 0.1
             lowy = min(p3y, p4y) - 0.1
             highy = max(p3y, p4y) + 0.1
-            if lowx <= xy[0] and xy[0] <= highx and lowy <= xy[1] and xy[1] <= highy:
-                return xy
+            if lowx <= x and x <= highx and lowy <= y and y <= highy:
+                return (True, x, y)
+    return (False, 0.0, 0.0)
+
+
+def _jit(signature, fn):
+    """
+    Eagerly compile fn to machine code with numba. The explicit
+    signature makes the compile happen here, at import, rather than on
+    the first simulation step, and cache=True persists the machine
+    code to disk so later imports skip compilation entirely. If numba
+    is missing, or compilation fails (for example, an unwritable cache
+    directory), the pure-Python fn is used instead.
+    """
+    if njit is None:
+        return fn
+    try:
+        return njit(signature, cache=True)(fn)
+    except Exception:
+        return fn
+
+
+# The segment-intersection primitives are called per-ray,
+# per-wall-segment during sensor simulation:
+ccw = _jit(
+    "boolean(float64, float64, float64, float64, float64, float64)",
+    ccw,
+)
+intersect = _jit(
+    "boolean(float64, float64, float64, float64,"
+    " float64, float64, float64, float64)",
+    intersect,
+)
+coefs = _jit(
+    "UniTuple(float64, 3)(float64, float64, float64, float64)",
+    coefs,
+)
+intersect_coefs = _jit(
+    "Tuple((boolean, float64, float64))"
+    "(float64, float64, float64, float64, float64, float64)",
+    intersect_coefs,
+)
+_intersect_hit = _jit(
+    "Tuple((boolean, float64, float64))"
+    "(float64, float64, float64, float64,"
+    " float64, float64, float64, float64)",
+    _intersect_hit,
+)
+
+
+def intersect_hit(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y):
+    """
+    Compute the intersection between two lines.
+    """
+    hit, x, y = _intersect_hit(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y)
+    if hit:
+        return [x, y]
     return None
 
 
+def batched_intersect_hit(p1x, p1y, p2x, p2y, ax, ay, bx, by, sa, sb, sc):
+    """
+    Test one ray segment against N wall segments held in parallel
+    float64 arrays: endpoints in (ax, ay, bx, by) and precomputed line
+    coefficients in (sa, sb, sc). Returns (hit, x, y) arrays of
+    length N.
+    """
+    n = len(ax)
+    hit = np.empty(n, dtype=np.bool_)
+    hx = np.empty(n, dtype=np.float64)
+    hy = np.empty(n, dtype=np.float64)
+    # The ray coefficients and bounding box are loop-invariant:
+    a1 = p1y - p2y
+    b1 = p2x - p1x
+    c1 = p2x * p1y - p1x * p2y
+    ray_lowx = min(p1x, p2x) - 0.1
+    ray_highx = max(p1x, p2x) + 0.1
+    ray_lowy = min(p1y, p2y) - 0.1
+    ray_highy = max(p1y, p2y) + 0.1
+    for i in range(n):
+        hit[i] = False
+        hx[i] = 0.0
+        hy[i] = 0.0
+        a2 = sa[i]
+        b2 = sb[i]
+        c2 = sc[i]
+        D = a1 * b2 - b1 * a2
+        if D != 0:
+            x = (c1 * b2 - b1 * c2) / D
+            y = (a1 * c2 - c1 * a2) / D
+            # now check to see on both segments:
+            if (ray_lowx <= x and x <= ray_highx) and (
+                ray_lowy <= y and y <= ray_highy
+            ):
+                lowx = min(ax[i], bx[i]) - 0.1
+                highx = max(ax[i], bx[i]) + 0.1
+                lowy = min(ay[i], by[i]) - 0.1
+                highy = max(ay[i], by[i]) + 0.1
+                if lowx <= x and x <= highx and lowy <= y and y <= highy:
+                    hit[i] = True
+                    hx[i] = x
+                    hy[i] = y
+    return hit, hx, hy
+
+
+batched_intersect_hit = _jit(
+    "Tuple((boolean[::1], float64[::1], float64[::1]))"
+    "(float64, float64, float64, float64,"
+    " float64[::1], float64[::1], float64[::1], float64[::1],"
+    " float64[::1], float64[::1], float64[::1])",
+    batched_intersect_hit,
+)
+
+
+def batched_fan_intersect_hit(p1x, p1y, ex, ey, ax, ay, bx, by, sa, sb, sc):
+    """
+    Test a fan of B rays sharing one origin against N wall segments.
+    Ray endpoints are in (ex, ey); walls as in batched_intersect_hit.
+    Returns (hit, x, y) arrays of shape (B, N).
+    """
+    b = len(ex)
+    n = len(ax)
+    hit = np.empty((b, n), dtype=np.bool_)
+    hx = np.empty((b, n), dtype=np.float64)
+    hy = np.empty((b, n), dtype=np.float64)
+    for j in range(b):
+        hit[j], hx[j], hy[j] = batched_intersect_hit(
+            p1x, p1y, ex[j], ey[j], ax, ay, bx, by, sa, sb, sc
+        )
+    return hit, hx, hy
+
+
+batched_fan_intersect_hit = _jit(
+    "Tuple((boolean[:, ::1], float64[:, ::1], float64[:, ::1]))"
+    "(float64, float64, float64[::1], float64[::1],"
+    " float64[::1], float64[::1], float64[::1], float64[::1],"
+    " float64[::1], float64[::1], float64[::1])",
+    batched_fan_intersect_hit,
+)
+
+
 def format_time(time):
     hours = time // 3600
     minutes = (time % 3600) // 60
@@ -158,6 +337,28 @@ def format_time(time):
     return "%02d:%02d:%04.1f" % (hours, minutes, seconds)
 
 
+def _scandir_json_files(path):
+    """
+    Find all *.json files below path, like
+    glob.glob("**/*.json", recursive=True) but without the
+    per-directory pattern matching overhead.
+    """
+    found = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".json"):
+                        found.append(entry.path)
+        except OSError:
+            pass
+    return found
+
+
 def load_world(filename=None):
     """
     worlds/
@@ -176,7 +377,7 @@ def load_world(filename=None):
         for path in get_aitk_search_paths():
             print("Directory:", path)
             files = sorted(
-                glob.glob(os.path.join(path, "**", "*.json"), recursive=True),
+                _scandir_json_files(path),
                 key=lambda filename: (filename.count("/"), filename),
             )
             if len(files) > 0:
@@ -209,6 +410,10 @@ def load_image(filename, width=None, height=None):
     if pathname is not None:
         image = Image.open(pathname)
         if width is not None and height is not None:
+            # Image.open is lazy; for formats that support it (JPEG),
+            # draft() decodes directly to a size near the target so the
+            # full-resolution image is never materialized:
+            image.draft(None, (width, height))
             image = image.resize((width, height))
         return image
 
@@ -217,7 +422,12 @@ def find_resource(filename=None):
     if filename is None:
         print("Searching for aitk.robots files...")
         for path in get_aitk_search_paths():
-            files = sorted(glob.glob(os.path.join(path, "*.*")))
+            try:
+                files = sorted(
+                    entry.path for entry in os.scandir(path) if "." in entry.name
+                )
+            except OSError:
+                files = []
             print("Directory:", path)
             if len(files) > 0:
                 for filename in files:
@@ -239,6 +449,12 @@ def image_to_png(image):
         return fp.getvalue()
 
 
+def image_to_jpeg(image, quality=85):
+    with io.BytesIO() as fp:
+        image.convert("RGB").save(fp, format="jpeg", quality=quality)
+        return fp.getvalue()
+
+
 def image_to_gif(image):
     # Leave fp opened
     from PIL import Image
@@ -265,46 +481,96 @@ def gallery(*images, border_width=1, background_color=(255, 255, 255)):
     size = images[0].size
     size = size[0] + (border_width * 2), size[1] + (border_width * 2)
 
-    gallery_image = Image.new(
-        mode="RGBA",
-        size=(int(gallery_cols * size[0]), int(gallery_rows * size[1])),
-        color=background_color,
+    if len(background_color) == 3:
+        background_color = tuple(background_color) + (255,)
+
+    # Tile the images into one RGBA array rather than pasting
+    # each one through PIL:
+    grid = np.empty(
+        (int(gallery_rows * size[1]), int(gallery_cols * size[0]), 4),
+        dtype=np.uint8,
     )
+    grid[:, :] = background_color
 
     for i, image in enumerate(images):
         if image.mode != "RGBA":
             image = image.convert("RGBA")
-        location = (
-            int((i % gallery_cols) * size[0]) + border_width,
-            int((i // gallery_cols) * size[1]) + border_width,
-        )
-        gallery_image.paste(image, location)
-    return gallery_image
+        pixels = np.asarray(image)
+        x = int((i % gallery_cols) * size[0]) + border_width
+        y = int((i // gallery_cols) * size[1]) + border_width
+        grid[y : y + pixels.shape[0], x : x + pixels.shape[1]] = pixels
+    return Image.fromarray(grid, "RGBA")
 
 
 class arange:
+    """
+    An inclusive range of numbers, like range() but allowing
+    float start/stop/step.
+    """
+
     def __init__(self, start, stop, step):
         self.start = start
         self.stop = stop
         self.step = step
 
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("arange index out of range")
+        return self.start + index * self.step
+
     def __iter__(self):
-        current = self.start
-        if self.step > 0:
-            while current <= self.stop:
-                yield current
-                current += self.step
-        else:
-            while current >= self.stop:
-                yield current
-                current += self.step
+        # Index arithmetic rather than accumulation, so values don't
+        # accumulate float error:
+        return iter([self.start + i * self.step for i in range(len(self))])
 
     def __len__(self):
-        return abs(self.stop - self.start) / abs(self.step)
+        span = (self.stop - self.start) / self.step
+        if span < 0:
+            return 0
+        return int(math.floor(span)) + 1
 
 
 def distance(x1, y1, x2, y2):
-    return math.sqrt((x1 - x2) * (x1 - x2) + (y1 - y2) * (y1 - y2))
+    return math.hypot(x1 - x2, y1 - y2)
+
+
+def distance_squared(x1, y1, x2, y2):
+    # For comparing distances without paying for the square root:
+    return (x1 - x2) * (x1 - x2) + (y1 - y2) * (y1 - y2)
+
+
+def _distance_point_to_line_3d(px, py, pz, sx, sy, sz, ex, ey, ez):
+    # Flattened scalar version of dot/length/vector/unit/scale/add;
+    # no tuples are built in this hot path.
+    lx = ex - sx
+    ly = ey - sy
+    lz = ez - sz
+    vx = px - sx
+    vy = py - sy
+    vz = pz - sz
+    line_len = math.sqrt(lx * lx + ly * ly + lz * lz)
+    inv_len = 1.0 / line_len
+    t = (
+        (lx / line_len) * (vx * inv_len)
+        + (ly / line_len) * (vy * inv_len)
+        + (lz / line_len) * (vz * inv_len)
+    )
+    # Branchless clamp; LLVM lowers this to min/max instructions:
+    t = max(0.0, min(1.0, t))
+    nx = lx * t
+    ny = ly * t
+    nz = lz * t
+    # Optipization: assume 2D:
+    dist = math.sqrt((nx - vx) * (nx - vx) + (ny - vy) * (ny - vy))
+    return (dist, nx + sx, ny + sy, nz + sz)
+
+
+_distance_point_to_line_3d = _jit(
+    "UniTuple(float64, 4)"
+    "(float64, float64, float64, float64, float64,"
+    " float64, float64, float64, float64)",
+    _distance_point_to_line_3d,
+)
 
 
 def distance_point_to_line_3d(point, line_start, line_end):
@@ -312,47 +578,48 @@ def distance_point_to_line_3d(point, line_start, line_end):
     Compute distance and location to closest point
     on a line segment in 3D.
     """
-    line_vec = vector(line_start, line_end)
-    point_vec = vector(line_start, point)
-    line_len = length(line_vec)
-    line_unitvec = unit(line_vec)
-    point_vec_scaled = scale(point_vec, 1.0 / line_len)
-    t = dot(line_unitvec, point_vec_scaled)
-    if t < 0.0:
-        t = 0.0
-    elif t > 1.0:
-        t = 1.0
-    nearest = scale(line_vec, t)
-    # Optipization: assume 2D:
-    dist = distance(nearest[0], nearest[1], point_vec[0], point_vec[1])
-    nearest = add(nearest, line_start)
-    return (dist, nearest)
+    dist, nx, ny, nz = _distance_point_to_line_3d(
+        point[0], point[1], point[2],
+        line_start[0], line_start[1], line_start[2],
+        line_end[0], line_end[1], line_end[2],
+    )
+    return (dist, (nx, ny, nz))
 
 
 def distance_point_to_line(point, line_start, line_end):
-    return distance_point_to_line_3d(
-        (point[0], point[1], 0),
-        (line_start[0], line_start[1], 0),
-        (line_end[0], line_end[1], 0),
+    dist, nx, ny, nz = _distance_point_to_line_3d(
+        point[0], point[1], 0.0,
+        line_start[0], line_start[1], 0.0,
+        line_end[0], line_end[1], 0.0,
     )
+    return (dist, (nx, ny, nz))
 
 
 def json_dump(config, fp, sort_keys=True, indent=4):
-    dumps(fp, config, sort_keys=sort_keys, indent=indent)
+    # Use a C serializer when one is available; the recursive
+    # pure-Python dumps is kept as the fallback:
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2  # orjson only offers 2-space indent
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        fp.write(orjson.dumps(config, option=option).decode("utf-8"))
+    elif ujson is not None:
+        ujson.dump(config, fp, sort_keys=sort_keys, indent=indent)
+    else:
+        dumps(fp, config, sort_keys=sort_keys, indent=indent)
 
 
 def dumps(fp, obj, level=0, sort_keys=True, indent=4, newline="\n", space=" "):
     if isinstance(obj, dict):
-        if sort_keys:
-            obj = OrderedDict({key: obj[key] for key in sorted(obj.keys())})
+        keys = sorted(obj) if sort_keys else obj
         fp.write(newline + (space * indent * level) + "{" + newline)
         comma = ""
-        for key, value in obj.items():
+        for key in keys:
             fp.write(comma)
             comma = "," + newline
             fp.write(space * indent * (level + 1))
             fp.write('"%s":%s' % (key, space))
-            dumps(fp, value, level + 1, sort_keys, indent, newline, space)
+            dumps(fp, obj[key], level + 1, sort_keys, indent, newline, space)
         fp.write(newline + (space * indent * level) + "}")
     elif isinstance(obj, str):
         fp.write('"%s"' % obj)
@@ -394,13 +661,15 @@ class throttle(object):
     """
 
     def __init__(self, seconds=0, minutes=0, hours=0):
-        self.throttle_period = timedelta(seconds=seconds, minutes=minutes, hours=hours)
-        self.time_of_last_call = datetime.min
+        self.throttle_period = seconds + minutes * 60 + hours * 3600
+        self.time_of_last_call = float("-inf")
 
     def __call__(self, fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            now = datetime.now()
+            # time.monotonic is cheaper than datetime.now and immune
+            # to wall-clock adjustments:
+            now = time.monotonic()
             time_since_last_call = now - self.time_of_last_call
 
             if time_since_last_call > self.throttle_period:
@@ -446,14 +715,11 @@ class Color:
             self.alpha = 255
 
     def hex_to_rgba(self, hex_string):
-        r_hex = hex_string[1:3]
-        g_hex = hex_string[3:5]
-        b_hex = hex_string[5:7]
-        if len(hex_string) > 7:
-            a_hex = hex_string[7:9]
-        else:
-            a_hex = "FF"
-        return int(r_hex, 16), int(g_hex, 16), int(b_hex, 16), int(a_hex, 16)
+        # One C-level parse instead of four int(s, 16) calls:
+        raw = bytes.fromhex(hex_string[1:9])
+        if len(raw) > 3:
+            return raw[0], raw[1], raw[2], raw[3]
+        return raw[0], raw[1], raw[2], 255
 
     def __str__(self):
         if self.name is not None:
@@ -489,15 +755,14 @@ class Color:
 
 
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
     def __getitem__(self, item):
-        if item == 0:
-            return self.x
-        elif item == 1:
-            return self.y
+        return (self.x, self.y)[item]
 
     def __len__(self):
         return 2
@@ -510,6 +775,8 @@ class Point:
 
 
 class Line:
+    __slots__ = ("p1", "p2")
+
     def __init__(self, p1, p2):
         self.p1 = p1
         self.p2 = p2
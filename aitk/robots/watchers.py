@@ -8,10 +8,22 @@
 #
 # *************************************
 
+import atexit
 import json
 import os
+import subprocess
 import threading
 import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
 
 from IPython.display import HTML as display_HTML, Image as display_Image, display
 from ipywidgets import (
@@ -30,9 +42,30 @@ from ipywidgets import (
     VBox,
 )
 
-from .utils import Point, arange, image_to_gif, image_to_png, progress_bar
+from .utils import (
+    Point,
+    image_to_gif,
+    image_to_jpeg,
+    image_to_png,
+    progress_bar,
+)
 from .world import World
 
+# The pixelated-image style only needs to reach the notebook once
+# per kernel:
+_CSS_INJECTED = False
+
+# Live playback threads, stopped at interpreter shutdown:
+_players = weakref.WeakSet()
+
+
+def _stop_players():
+    for player in list(_players):
+        player.stop()
+
+
+atexit.register(_stop_players)
+
 
 def make_attr_widget(obj, map, title, attrs, labels):
     box = VBox()
@@ -56,6 +89,7 @@ class Watcher:
         All watchers need a widget.
         """
         self.widget = None
+        self._dirty = False
 
     def draw(self):
         """
@@ -76,9 +110,40 @@ class Watcher:
         """
         raise NotImplementedError("need to implement watcher.reset()")
 
+    def _index_attrs(self):
+        """
+        Precompute which attribute indices are shown and hidden, so
+        draw() doesn't serialize attributes nobody can see.
+        """
+        shown = set(self.visible)
+        self._visible_indices = [
+            i for i, attr in enumerate(self.all_attrs) if attr in shown
+        ]
+        self._hidden_indices = [
+            i for i, attr in enumerate(self.all_attrs) if attr not in shown
+        ]
+
+    def _watch_visibility(self):
+        """
+        Observe the widget layout so that draws skipped while the
+        widget is hidden are flushed when it is shown again.
+        """
+        self.widget.layout.observe(self._on_display_change, names="display")
+
+    def _is_visible(self):
+        return self.widget is None or self.widget.layout.display != "none"
+
+    def _on_display_change(self, change):
+        if change["new"] != "none" and self._dirty:
+            self.draw()
+
     def _inject_css(self):
+        global _CSS_INJECTED
+        if _CSS_INJECTED:
+            return
         css = HTML("<style>img.pixelated {image-rendering: pixelated;}</style>")
         display(css)
+        _CSS_INJECTED = True
 
     def watch(self, **kwargs):
         """
@@ -108,6 +173,7 @@ class RobotWatcher(Watcher):
             self.visible = self.all_attrs[:]
         else:
             self.visible = attributes[:]
+        self._index_attrs()
         self.labels = [
             "Name:",
             "X:",
@@ -118,6 +184,13 @@ class RobotWatcher(Watcher):
             "Rotate vel:",
             "State:",
         ]
+        # Encoded thumbnails keyed by pose fingerprint (bounded LRU),
+        # and the key last written to the image widget:
+        self._png_cache = OrderedDict()
+        self._png_key = None
+        # Last strings/display states written to the widgets:
+        self._last_values = {}
+        self._last_display = {}
         widget = make_attr_widget(self.robot, self.map, None, self.all_attrs, self.labels)
         self.image = Image(layout=Layout(
             width="-webkit-fill-available",
@@ -129,6 +202,7 @@ class RobotWatcher(Watcher):
         widget.children = [self.image] + list(widget.children)
 
         self.widget = widget
+        self._watch_visibility()
         self.update()
         self.draw()
 
@@ -149,27 +223,57 @@ class RobotWatcher(Watcher):
                 self.visible = self.all_attrs[:]
             else:
                 self.visible = attributes[:]
+            self._index_attrs()
 
     def draw(self):
         if self.robot.world is None:
             print("This robot is not in a world")
             return
+        if not self._is_visible():
+            # Remember to redraw when shown again:
+            self._dirty = True
+            return
+        self._dirty = False
 
         if self.show_robot:
-            image = self.robot.get_image(size=self.size)
-            self.image.value = image_to_png(image)
-        for i in range(len(self.all_attrs)):
-            attr_name = self.all_attrs[i]
-            attr = getattr(self.robot, attr_name)
+            key = (
+                round(self.robot.x, 3),
+                round(self.robot.y, 3),
+                round(self.robot.a, 4),
+                self.size,
+                self.robot.stalled,
+            )
+            if key != self._png_key:
+                png = self._png_cache.get(key)
+                if png is None:
+                    image = self.robot.get_image(size=self.size)
+                    png = image_to_png(image)
+                    self._png_cache[key] = png
+                    if len(self._png_cache) > 64:
+                        self._png_cache.popitem(last=False)
+                else:
+                    self._png_cache.move_to_end(key)
+                self.image.value = png
+                self._png_key = key
+        for i in self._visible_indices:
+            label = self.labels[i]
+            attr = getattr(self.robot, self.all_attrs[i])
             if isinstance(attr, dict):
                 string = json.dumps(attr, sort_keys=True, indent=2)
             else:
                 string = str(attr)
-            if attr_name in self.visible:
-                self.map[self.labels[i]].value = string
-                self.map[self.labels[i]].layout.display = "flex"
-            else:
-                self.map[self.labels[i]].layout.display = "none"
+            # Only write (and re-send to the frontend) on change:
+            if self._last_values.get(label) != string:
+                self.map[label].value = string
+                self._last_values[label] = string
+            if self._last_display.get(label) != "flex":
+                self.map[label].layout.display = "flex"
+                self._last_display[label] = "flex"
+        for i in self._hidden_indices:
+            label = self.labels[i]
+            if self._last_display.get(label) != "none":
+                self.map[label].layout.display = "none"
+                self._last_display[label] = "none"
 
     def update(self):
         pass
@@ -188,27 +292,44 @@ class AttributesWatcher(Watcher):
             self.visible = self.all_attrs[:]
         else:
             self.visible = attributes[:]
+        self._index_attrs()
         self.title = title
         self.labels = labels
         if self.labels is None:
             self.labels = ["%s:" % attr for attr in attrs]
+        # Last strings/display states written to the widgets:
+        self._last_values = {}
+        self._last_display = {}
         self.widget = make_attr_widget(self.obj, self.map, title, attrs, labels)
+        self._watch_visibility()
         self.update()
         self.draw()
 
     def draw(self):
-        for i in range(len(self.all_attrs)):
-            attr_name = self.all_attrs[i]
-            attr = getattr(self.obj, attr_name)
+        if not self._is_visible():
+            # Remember to redraw when shown again:
+            self._dirty = True
+            return
+        self._dirty = False
+        for i in self._visible_indices:
+            label = self.labels[i]
+            attr = getattr(self.obj, self.all_attrs[i])
             if isinstance(attr, dict):
                 string = json.dumps(attr, sort_keys=True, indent=2)
             else:
                 string = str(attr)
-            if attr_name in self.visible:
-                self.map[self.labels[i]].value = string
-                self.map[self.labels[i]].layout.display = "flex"
-            else:
-                self.map[self.labels[i]].layout.display = "none"
+            # Only write (and re-send to the frontend) on change:
+            if self._last_values.get(label) != string:
+                self.map[label].value = string
+                self._last_values[label] = string
+            if self._last_display.get(label) != "flex":
+                self.map[label].layout.display = "flex"
+                self._last_display[label] = "flex"
+        for i in self._hidden_indices:
+            label = self.labels[i]
+            if self._last_display.get(label) != "none":
+                self.map[label].layout.display = "none"
+                self._last_display[label] = "none"
 
     def set_arguments(self, title=None, attributes=None):
         if title is not None:
@@ -220,6 +341,7 @@ class AttributesWatcher(Watcher):
                 self.visible = self.all_attrs[:]
             else:
                 self.visible = attributes[:]
+            self._index_attrs()
 
     def update(self):
         pass
@@ -239,18 +361,27 @@ class CameraWatcher(Watcher):
         if "width" not in kwargs:
             kwargs["width"] = "500px"
 
+        # Continuous camera output compresses much better (and
+        # faster) as JPEG than PNG:
         self.widget = Image(
+            format="jpeg",
             layout=Layout(
                 **kwargs
             )
         )
         self.widget.add_class("pixelated")
+        self._watch_visibility()
         # Update and draw:
         self.draw()
 
     def draw(self):
+        if not self._is_visible():
+            # Remember to redraw when shown again:
+            self._dirty = True
+            return
+        self._dirty = False
         picture = self.camera.get_image()
-        self.widget.value = image_to_png(picture)
+        self.widget.value = image_to_jpeg(picture)
 
     def update(self):
         pass
@@ -265,62 +396,134 @@ class _Player(threading.Thread):
     """
 
     def __init__(self, controller, time_wait=0.5):
-        self.controller = controller
+        # A weak reference, so a lingering thread doesn't keep the
+        # player (and through it, the world) alive:
+        self._controller_ref = weakref.ref(controller)
         threading.Thread.__init__(self)
         self.time_wait = time_wait
         self.can_run = threading.Event()
         self.can_run.clear()  # paused
+        self._interrupt = threading.Event()
+        self._stopped = threading.Event()
         self.daemon = True  # allows program to exit without waiting for join
+        _players.add(self)
 
     def run(self):
-        while True:
-            self.can_run.wait()
-            self.controller.goto("next")
-            time.sleep(self.time_wait)
+        next_deadline = time.monotonic()
+        while not self._stopped.is_set():
+            if not self.can_run.is_set():
+                # Poll, so a stopped thread exits even while paused:
+                if not self.can_run.wait(timeout=0.5):
+                    if self._controller_ref() is None:
+                        # The player widget was garbage collected while
+                        # paused; don't poll forever:
+                        break
+                    continue
+                # Resuming: restart the schedule from now.
+                next_deadline = time.monotonic()
+            controller = self._controller_ref()
+            if controller is None:
+                # The player widget was garbage collected:
+                break
+            controller.goto("next")
+            controller = None
+            # Enforce a small minimum period, so time_wait=0 doesn't
+            # busy-spin the thread:
+            next_deadline += max(self.time_wait, 0.01)
+            remaining = next_deadline - time.monotonic()
+            if remaining <= 0:
+                # goto took longer than the frame period; don't race
+                # to catch up, but still yield the CPU:
+                remaining = 0.001
+                next_deadline = time.monotonic()
+            # Interruptible sleep, so pause() takes effect at once:
+            self._interrupt.wait(timeout=remaining)
+            self._interrupt.clear()
 
     def pause(self):
         self.can_run.clear()
+        self._interrupt.set()
 
     def resume(self):
         self.can_run.set()
 
+    def stop(self):
+        self._stopped.set()
+        self._interrupt.set()
+
 
 class Recorder(Watcher):
     def __init__(self, world, play_rate=0.1):
         super().__init__()
-        self.states = []
+        # Recorded states, a (capacity, n_robots, 7) array of
+        # (x, y, a, vx, vy, va, stalled) rows; _n is the write cursor:
+        self.states = np.empty((0, len(world._robots), 7), dtype=np.float64)
+        self._n = 0
         self.orig_world = world
-        # Copy of the world for creating playback:
-        self.world = World(**world.to_json())
-        # Copy items needed for playback
-        for i in range(len(self.world._robots)):
-            # Copy list references:
-            self.world._robots[i].text_trace = self.orig_world._robots[i].text_trace
-            self.world._robots[i].pen_trace = self.orig_world._robots[i].pen_trace
+        # Rendered frames, keyed by state index (bounded LRU):
+        self._frame_cache = OrderedDict()
+        self._frame_cache_size = 512
+        # The playback copy of the world is built lazily (see the
+        # world property); recording alone never pays for it:
+        self._world = None
         self.widget = Player("Time:", self.goto, 0, play_rate)
 
+    @property
+    def world(self):
+        """
+        Copy of the world for creating playback, built on first use.
+        """
+        if self._world is None:
+            self._world = World(**self.orig_world.to_json())
+            # Copy items needed for playback
+            for i in range(len(self._world._robots)):
+                # Copy list references:
+                self._world._robots[i].text_trace = self.orig_world._robots[i].text_trace
+                self._world._robots[i].pen_trace = self.orig_world._robots[i].pen_trace
+        return self._world
+
     def draw(self):
-        self.widget.update_length(len(self.states))
+        self.widget.update_length(self._n)
 
     def update(self):
         # Record the states from the real world:
-        states = []
-        for robot in self.orig_world._robots:
-            states.append(
-                (
-                    robot.x,
-                    robot.y,
-                    robot.a,
-                    robot.vx,
-                    robot.vy,
-                    robot.va,
-                    robot.stalled,
-                )
+        robots = self.orig_world._robots
+        if len(robots) != self.states.shape[1]:
+            # Robots were added (or removed) mid-recording; rebuild
+            # the buffer at the new width, zero-filling history for
+            # robots that didn't exist yet:
+            grown = np.zeros(
+                (self.states.shape[0], len(robots), 7), dtype=np.float64
+            )
+            keep = min(self.states.shape[1], len(robots))
+            grown[: self._n, :keep] = self.states[: self._n, :keep]
+            self.states = grown
+        if self._n == self.states.shape[0]:
+            # Grow the buffer by doubling:
+            grown = np.empty(
+                (max(self.states.shape[0] * 2, 256),) + self.states.shape[1:],
+                dtype=np.float64,
             )
-        self.states.append(states)
+            grown[: self._n] = self.states[: self._n]
+            self.states = grown
+        for i, robot in enumerate(robots):
+            self.states[self._n, i] = (
+                robot.x,
+                robot.y,
+                robot.a,
+                robot.vx,
+                robot.vy,
+                robot.va,
+                robot.stalled,
+            )
+        self._n += 1
 
     def reset(self):
-        self.states = []
+        self.states = np.empty(
+            (0, len(self.orig_world._robots), 7), dtype=np.float64
+        )
+        self._n = 0
+        self._frame_cache.clear()
 
     def get_widget(self, play_rate=0.0):
         self.widget.player.time_wait = play_rate
@@ -333,53 +536,65 @@ class Recorder(Watcher):
     def get_trace(self, robot_index, current_index, max_length):
         # return as [Point(x,y), direction]
         start_index = max(current_index - max_length, 0)
-        return [
-            (Point(x, y), a)
-            for (x, y, a, vx, vy, va, stalled) in [
-                state[robot_index]
-                for state in self.states[start_index : current_index + 1]
-            ]
-        ]
+        trace = self.states[start_index : current_index + 1, robot_index, :3]
+        return [(Point(x, y), a) for (x, y, a) in trace]
 
     def goto(self, time):
-        index = round(time / 0.1)
-        # place robots where they go in copy:
-        if len(self.states) == 0:
-            for i, orig_robot in enumerate(self.orig_world._robots):
-                x, y, a, vx, vy, va, stalled = (
-                    orig_robot.x,
-                    orig_robot.y,
-                    orig_robot.a,
-                    orig_robot.vx,
-                    orig_robot.vy,
-                    orig_robot.va,
-                    orig_robot.stalled,
-                )
-                self.world.robots[i]._set_pose(x, y, a, clear_trace=False)
-                self.world.robots[i].vx = vx
-                self.world.robots[i].vy = vy
-                self.world.robots[i].va = va
-                self.world.robots[i].stalled = stalled
-                self.world.robots[i].trace[:] = []
-        else:
-            index = max(min(len(self.states) - 1, index), 0)
-            for i, state in enumerate(self.states[index]):
-                x, y, a, vx, vy, va, stalled = state
-                self.world.robots[i]._set_pose(x, y, a, clear_trace=False)
-                self.world.robots[i].vx = vx
-                self.world.robots[i].vy = vy
-                self.world.robots[i].va = va
-                self.world.robots[i].stalled = stalled
-                if self.world.robots[i].do_trace:
-                    self.world.robots[i].trace = self.get_trace(
-                        i, index, self.world.robots[i].max_trace_length
+        return self.goto_index(round(time / 0.1))
+
+    def goto_index(self, index):
+        """
+        Go directly to a recorded state index (time = index * 0.1).
+        """
+        if self._n > 0:
+            index = max(min(self._n - 1, index), 0)
+            # Scrubbing back to a rendered frame is a dict lookup:
+            if index in self._frame_cache:
+                self._frame_cache.move_to_end(index)
+                return self._frame_cache[index]
+        # place robots where they go in copy; one update and one
+        # draw happen when the batch exits:
+        with self.world._batch():
+            if self._n == 0:
+                for i, orig_robot in enumerate(self.orig_world._robots):
+                    x, y, a, vx, vy, va, stalled = (
+                        orig_robot.x,
+                        orig_robot.y,
+                        orig_robot.a,
+                        orig_robot.vx,
+                        orig_robot.vy,
+                        orig_robot.va,
+                        orig_robot.stalled,
                     )
-        self.world.time = time
-        if self.world.time == 0:
-            # In case it changed:
-            self.world.reset_ground_image()
-        self.world.update()
-        picture = self.world.display(format="image")
+                    self.world.robots[i]._set_pose(x, y, a, clear_trace=False)
+                    self.world.robots[i].vx = vx
+                    self.world.robots[i].vy = vy
+                    self.world.robots[i].va = va
+                    self.world.robots[i].stalled = stalled
+                    self.world.robots[i].trace[:] = []
+            else:
+                for i, state in enumerate(self.states[index]):
+                    x, y, a, vx, vy, va, stalled = state
+                    self.world.robots[i]._set_pose(x, y, a, clear_trace=False)
+                    self.world.robots[i].vx = vx
+                    self.world.robots[i].vy = vy
+                    self.world.robots[i].va = va
+                    self.world.robots[i].stalled = bool(stalled)
+                    if self.world.robots[i].do_trace:
+                        self.world.robots[i].trace = self.get_trace(
+                            i, index, self.world.robots[i].max_trace_length
+                        )
+            self.world.time = round(index * 0.1, 1)
+            if self.world.time == 0:
+                # In case it changed:
+                self.world._reset_ground_image()
+        # get_image returns the backend's live canvas, which the next
+        # redraw overwrites in place; hand out a snapshot instead:
+        picture = self.world.get_image().copy()
+        if self._n > 0:
+            self._frame_cache[index] = picture
+            if len(self._frame_cache) > self._frame_cache_size:
+                self._frame_cache.popitem(last=False)
         return picture
 
     def save_as(
@@ -392,22 +607,36 @@ class Recorder(Watcher):
         duration=100,
         embed=False,
         mp4=True,
+        gif=None,
     ):
         """
-        Save as animated gif and optionally mp4; show with controls.
+        Save as animated gif and/or mp4; show with controls.
         loop - 0 means continually
         duration - in MS
+        gif - None means only write the gif when mp4 is False
         """
         if stop is None:
-            stop = len(self.states) * 0.1
-
-        stop = min(stop, len(self.states) * 0.1)
-
-        frames = []
-        for time_step in progress_bar(arange(start, stop, step)):
-            # Special function to load as gif, leave fp open
-            picture = image_to_gif(self.goto(time_step))
-            frames.append(picture)
+            stop = self._n * 0.1
+
+        stop = min(stop, self._n * 0.1)
+
+        if mp4 and not gif:
+            # Stream raw frames straight into ffmpeg; no GIF encode
+            # and no intermediate file:
+            return self._save_mp4(movie_name, start, stop, step, duration)
+
+        # goto() must run on this thread (it mutates the playback
+        # world), but the GIF encode of each frame is independent, so
+        # encoding overlaps rendering of the next frame:
+        # The schedule is allocated once (stop is inclusive, like
+        # utils.arange):
+        schedule = np.arange(start, stop + step / 2, step)
+        futures = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for time_step in progress_bar(schedule):
+                # Special function to load as gif, leave fp open
+                futures.append(executor.submit(image_to_gif, self.goto(time_step)))
+            frames = [future.result() for future in futures]
 
         if frames:
             # First, save animated gif:
@@ -439,6 +668,87 @@ class Recorder(Watcher):
                         "error running ffmpeg; see console log message or use mp4=False"
                     )
 
+    def _save_mp4(self, movie_name, start, stop, step, duration):
+        """
+        Pipe raw RGBA frames into ffmpeg to produce an mp4, via the
+        imageio-ffmpeg bindings when available.
+        """
+        if os.path.exists(movie_name + ".mp4"):
+            os.remove(movie_name + ".mp4")
+        schedule = np.arange(start, stop + step / 2, step)
+        fps = 1000.0 / duration
+        if imageio_ffmpeg is not None:
+            ok = self._write_mp4_imageio(movie_name, schedule, fps)
+        else:
+            ok = self._write_mp4_subprocess(movie_name, schedule, fps)
+        if ok:
+            return display_HTML(
+                """<video src='{0}.mp4' controls style="width: 100%"></video>""".format(
+                    movie_name
+                )
+            )
+        print("error running ffmpeg; see console log message or use mp4=False")
+
+    def _write_mp4_imageio(self, movie_name, schedule, fps):
+        """
+        Stream frames through imageio-ffmpeg's bundled ffmpeg.
+        """
+        writer = None
+        try:
+            for time_step in progress_bar(schedule):
+                frame = self.goto(time_step).convert("RGBA")
+                if writer is None:
+                    writer = imageio_ffmpeg.write_frames(
+                        movie_name + ".mp4",
+                        size=frame.size,
+                        fps=fps,
+                        pix_fmt_in="rgba",
+                        output_params=["-movflags", "faststart"],
+                    )
+                    writer.send(None)  # seed the generator
+                writer.send(frame.tobytes())
+            if writer is None:
+                return False
+            writer.close()
+        except Exception:
+            return False
+        return True
+
+    def _write_mp4_subprocess(self, movie_name, schedule, fps):
+        """
+        Stream frames into a system ffmpeg found on the PATH.
+        """
+        proc = None
+        try:
+            for time_step in progress_bar(schedule):
+                frame = self.goto(time_step).convert("RGBA")
+                if proc is None:
+                    command = [
+                        "ffmpeg",
+                        "-f", "rawvideo",
+                        "-pix_fmt", "rgba",
+                        "-s", "%sx%s" % frame.size,
+                        "-r", "%g" % fps,
+                        "-i", "-",
+                        "-movflags", "faststart",
+                        "-pix_fmt", "yuv420p",
+                        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+                        movie_name + ".mp4",
+                    ]
+                    proc = subprocess.Popen(
+                        command,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                proc.stdin.write(frame.tobytes())
+        except (OSError, BrokenPipeError):
+            return False
+        if proc is None:
+            return False
+        proc.stdin.close()
+        return proc.wait() == 0
+
 
 class Player(VBox):
     def __init__(self, title, function, length, play_rate=0.1):
@@ -451,6 +761,14 @@ class Player(VBox):
         self.function = function
         self.length = length
         self.output = Output()
+        # Debounce state for slider-driven renders:
+        self._pending_value = None
+        self._render_timer = None
+        self._render_lock = threading.Lock()
+        self._render_mutex = threading.Lock()
+        self._debounce_delay = 0.05
+        self._last_render_time = float("-inf")
+        self._last_results = []
         self.position_text = FloatText(value=0.0)
         self.total_text = Label(
             value="of %s" % round(self.length * 0.1, 1))
@@ -463,26 +781,43 @@ class Player(VBox):
         self.control_slider.max = round(max(self.length * 0.1, 0), 1)
 
     def goto(self, position):
-        #### Position it:
+        #### Compute the target position:
         if position == "begin":
-            self.control_slider.value = 0.0
+            target = 0.0
         elif position == "end":
-            self.control_slider.value = round(self.length * 0.1, 1)
+            target = round(self.length * 0.1, 1)
         elif position == "prev":
             if self.control_slider.value - 0.1 < 0:
-                self.control_slider.value = round(self.length * 0.1, 1)  # wrap around
+                target = round(self.length * 0.1, 1)  # wrap around
             else:
-                self.control_slider.value = round(
-                    max(self.control_slider.value - 0.1, 0), 1
-                )
+                target = round(max(self.control_slider.value - 0.1, 0), 1)
         elif position == "next":
             if round(self.control_slider.value + 0.1, 1) > round(self.length * 0.1, 1):
-                self.control_slider.value = 0  # wrap around
+                target = 0.0  # wrap around
             else:
-                self.control_slider.value = round(
+                target = round(
                     min(self.control_slider.value + 0.1, self.length * 0.1), 1
                 )
-        self.position_text.value = round(self.control_slider.value, 1)
+        else:
+            self.position_text.value = round(self.control_slider.value, 1)
+            return
+        # No-op navigation shouldn't trigger a redundant render:
+        if abs(self.control_slider.value - target) < 0.05:
+            return
+        # Batch the widget writes into one notification flush:
+        with self.control_slider.hold_trait_notifications():
+            self.control_slider.value = target
+        self.position_text.value = round(target, 1)
+
+    def stop(self):
+        """
+        Stop the background playback thread for good.
+        """
+        self.player.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
 
     def toggle_play(self, button):
         ## toggle
@@ -553,14 +888,50 @@ class Player(VBox):
 
     def update_slider_control(self, change):
         """
-        If the slider changes the value, call the function
-        and update display areas.
+        If the slider changes the value, render. The first change
+        after a quiet interval renders right away, so a stream of
+        rapid changes (drags, playback stepping) still shows frames;
+        the follow-ups within the interval collapse into at most one
+        deferred render.
         """
         if change["name"] == "value":
             self.position_text.value = self.control_slider.value
-            self.output.clear_output(wait=True)
-            results = self.function(self.control_slider.value)
+            with self._render_lock:
+                self._pending_value = change["new"]
+                if self._render_timer is not None:
+                    self._render_timer.cancel()
+                    self._render_timer = None
+                elapsed = time.monotonic() - self._last_render_time
+                render_now = elapsed >= self._debounce_delay
+                if not render_now:
+                    self._render_timer = threading.Timer(
+                        self._debounce_delay, self._render_pending
+                    )
+                    self._render_timer.daemon = True
+                    self._render_timer.start()
+            if render_now:
+                self._render_pending()
+
+    def _render_pending(self):
+        """
+        Render the most recently requested slider value and update
+        the display areas.
+        """
+        with self._render_lock:
+            value = self._pending_value
+            self._render_timer = None
+        # Serialize renders: the function steps the shared playback
+        # world, so overlapping calls would tear frames.
+        with self._render_mutex:
+            self._last_render_time = time.monotonic()
+            results = self.function(value)
             if not isinstance(results, (list, tuple)):
                 results = [results]
+            # The displayers replace content in place (stable display
+            # ids), so there is no need to clear the output area first;
+            # skip results that are unchanged since the last render:
             for i in range(len(self.displayers)):
+                if i < len(self._last_results) and results[i] is self._last_results[i]:
+                    continue
                 self.displayers[i].update(results[i])
+            self._last_results = list(results)
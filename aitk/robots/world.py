@@ -13,6 +13,8 @@ import random
 import re
 import signal
 import time
+
+import numpy as np
 from threading import Thread
 from collections.abc import Sequence
 from contextlib import contextmanager
@@ -26,7 +28,7 @@ from .utils import (
     Color,
     Line,
     Point,
-    distance,
+    distance_squared,
     distance_point_to_line,
     format_time,
     json_dump,
@@ -224,6 +226,7 @@ class World:
         self._robots = []
         self._backend = None
         self._recording = False
+        self._suppress_draw = False
         self.config = config.copy()
         self._initialize()  # default values
         self.reset()  # from config
@@ -327,6 +330,7 @@ class World:
         self._bulbs = []
         self._bulb_rings = 7 # rings around bulb light
         self._complexity = 0
+        self._wall_segments = None
 
     def reset(self):
         """
@@ -712,7 +716,9 @@ class World:
                 robot.radius + random.random() * (self.height - 2 * robot.radius)
             )
             for other in self._robots:
-                if distance(px, py, other.x, other.y) < robot.radius + other.radius:
+                # Compare squared distances; no need for the sqrt:
+                radii = robot.radius + other.radius
+                if distance_squared(px, py, other.x, other.y) < radii * radii:
                     too_close = True
                     break
 
@@ -935,8 +941,53 @@ class World:
 
     def _compute_complexity(self):
         # Proxy for how much drawing
+        self._invalidate_wall_segments()
         return sum([len(wall.lines) for wall in self._walls])
 
+    def _invalidate_wall_segments(self):
+        """
+        Drop the cached wall-segment arrays; called whenever walls are
+        added or removed, or a robot's bounding lines move.
+        """
+        self._wall_segments = None
+
+    def _get_wall_segments(self):
+        """
+        Get the wall segments as (walls, ax, ay, bx, by, sa, sb, sc)
+        where walls is a list mapping segment index to its Wall,
+        (ax, ay, bx, by) are parallel float64 endpoint arrays, and
+        (sa, sb, sc) are the line coefficients of each segment,
+        precomputed once per wall change rather than once per ray.
+        """
+        if self._wall_segments is None:
+            walls = []
+            coords = []
+            for wall in self._walls:
+                for line in wall.lines:
+                    walls.append(wall)
+                    coords.append((line.p1.x, line.p1.y, line.p2.x, line.p2.y))
+            xyxy = np.array(coords, dtype=np.float64).reshape(-1, 4)
+            ax = np.ascontiguousarray(xyxy[:, 0])
+            ay = np.ascontiguousarray(xyxy[:, 1])
+            bx = np.ascontiguousarray(xyxy[:, 2])
+            by = np.ascontiguousarray(xyxy[:, 3])
+            sa = ay - by
+            sb = bx - ax
+            sc = bx * ay - ax * by
+            self._wall_segments = (walls, ax, ay, bx, by, sa, sb, sc)
+        return self._wall_segments
+
+    @property
+    def wall_xyxy(self):
+        """
+        The wall segments as a read-only (N, 4) float64 array of
+        (x1, y1, x2, y2) rows, one per segment.
+        """
+        walls, ax, ay, bx, by, sa, sb, sc = self._get_wall_segments()
+        xyxy = np.column_stack((ax, ay, bx, by))
+        xyxy.flags.writeable = False
+        return xyxy
+
     def step(self, time_step=None, show=True, real_time=True):
         """
         Run the simulator for 1 step.
@@ -999,10 +1050,26 @@ class World:
         if show:
             self._request_draw()
 
+    @contextmanager
+    def _batch(self):
+        """
+        Suppress intermediate draws while mutating many robots, then
+        run one update and force exactly one draw.
+        """
+        self._suppress_draw = True
+        try:
+            yield self
+        finally:
+            self._suppress_draw = False
+        self.update(show=False)
+        self.draw()  # force
+
     def _request_draw(self):
         """
         Draw the world. This function is throttled
         """
+        if self._suppress_draw:
+            return
         # Throttle:
         now = time.monotonic()
         time_since_last_call = now - self._time_of_last_call
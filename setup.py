@@ -49,8 +49,11 @@ setup_args = dict(
     long_description_content_type="text/markdown",
     packages=setuptools.find_namespace_packages(include=['aitk.*']),
     package_data={"aitk.robots": ["worlds/*.json", "worlds/*.png"]},
-    install_requires=["setuptools", "Pillow", "aitk.utils"],
-    extras_require={"jupyter": ["ipywidgets", "IPython", "bqplot"]},
+    install_requires=["setuptools", "numpy", "Pillow", "aitk.utils"],
+    extras_require={
+        "jupyter": ["ipywidgets", "IPython", "bqplot", "imageio-ffmpeg"],
+        "speed": ["numba"],
+    },
     python_requires=">=3.6",
     license="BSD-3-Clause",
     platforms="Linux, Mac OS X, Windows",
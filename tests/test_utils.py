@@ -10,7 +10,18 @@
 
 import math
 
-from aitk.robots.utils import arange, distance
+import numpy as np
+import pytest
+from PIL import Image
+
+from aitk.robots.utils import (
+    arange,
+    batched_intersect_hit,
+    distance,
+    distance_squared,
+    gallery,
+    intersect_hit,
+)
 
 
 def test_distance():
@@ -20,9 +31,79 @@ def test_distance():
         assert distance(x1, y1, x2, y2) == math.sqrt(2)
 
 
+def test_distance_squared():
+    assert distance_squared(0, 0, 3, 4) == 25
+    assert distance_squared(1, 1, 1, 1) == 0
+
+
 def test_arange():
     assert [1, 2, 3, 4, 5] == [x for x in arange(1, 5, 1)]
 
 
 def test_arange_neg():
     assert [5, 4, 3, 2, 1] == [x for x in arange(5, 1, -1)]
+
+
+def test_arange_float_step():
+    assert [0.0, 0.25, 0.5, 0.75, 1.0] == [x for x in arange(0, 1, 0.25)]
+
+
+def test_arange_len():
+    assert len(arange(1, 5, 1)) == 5
+    assert len(arange(0, 1, 0.1)) == 11
+    # Stop on the wrong side of start is an empty range:
+    assert len(arange(5, 1, 1)) == 0
+
+
+def test_arange_getitem():
+    numbers = arange(5, 1, -1)
+
+    assert numbers[0] == 5
+    assert numbers[4] == 1
+    with pytest.raises(IndexError):
+        numbers[5]
+
+
+def test_batched_intersect_hit_matches_scalar():
+    rng = np.random.default_rng(42)
+    ax = rng.uniform(0, 100, 50)
+    ay = rng.uniform(0, 100, 50)
+    bx = rng.uniform(0, 100, 50)
+    by = rng.uniform(0, 100, 50)
+    # Precomputed line coefficients, as in World._get_wall_segments:
+    sa = ay - by
+    sb = bx - ax
+    sc = bx * ay - ax * by
+
+    p1x, p1y, p2x, p2y = 10.0, 10.0, 90.0, 80.0
+    hit, hx, hy = batched_intersect_hit(
+        p1x, p1y, p2x, p2y, ax, ay, bx, by, sa, sb, sc
+    )
+
+    hits = 0
+    for i in range(len(ax)):
+        expected = intersect_hit(p1x, p1y, p2x, p2y, ax[i], ay[i], bx[i], by[i])
+        if expected is None:
+            assert not hit[i]
+        else:
+            assert hit[i]
+            assert [hx[i], hy[i]] == expected
+            hits += 1
+    # The random segments must actually exercise both outcomes:
+    assert 0 < hits < len(ax)
+
+
+def test_gallery_tiling():
+    red = Image.new("RGBA", (10, 10), (255, 0, 0, 255))
+    blue = Image.new("RGBA", (10, 10), (0, 0, 255, 255))
+
+    picture = gallery(red, blue, red, border_width=1)
+
+    # Three images tile into a 2 x 2 grid of 12 x 12 cells:
+    assert picture.size == (24, 24)
+    assert picture.getpixel((1, 1)) == (255, 0, 0, 255)
+    assert picture.getpixel((13, 1)) == (0, 0, 255, 255)
+    assert picture.getpixel((1, 13)) == (255, 0, 0, 255)
+    # Borders and the unused cell show the background:
+    assert picture.getpixel((0, 0)) == (255, 255, 255, 255)
+    assert picture.getpixel((13, 13)) == (255, 255, 255, 255)